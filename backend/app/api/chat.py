@@ -3,18 +3,23 @@ Chat API endpoints.
 """
 
 import re
-import threading
+from functools import lru_cache
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 
 from ..models import ChatRequest, ChatResponse, ModeInfo
-from ..core.dependencies import get_llm_client, get_memory_manager
+from ..core.dependencies import get_llm_client, get_memory_manager, get_auto_learner
 from ..services.interactions import save_interaction
 
 router = APIRouter()
 
+# Spanish indicators used by detect_input_language
+SPANISH_CHARS = frozenset('ñ¿¡áéíóúü')
+SPANISH_WORDS = frozenset({'hola', 'qué', 'cómo', 'por', 'para', 'está', 'esto', 'muy', 'bien'})
+WORD_RE = re.compile(r'\w+')
+
 
 def detect_input_language(text: str) -> Optional[str]:
     """Detect language from user input text. Returns language code or None if ambiguous."""
@@ -25,15 +30,34 @@ def detect_input_language(text: str) -> Optional[str]:
     if any('\u4e00' <= c <= '\u9fff' for c in text):
         return "zh"
     # Spanish indicators
-    spanish_chars = set('ñ¿¡áéíóúü')
-    spanish_words = {'hola', 'qué', 'cómo', 'por', 'para', 'está', 'esto', 'muy', 'bien'}
-    text_lower = text.lower()
-    words = set(re.findall(r'\w+', text_lower))
-    if any(c in text for c in spanish_chars) or words & spanish_words:
+    words = set(WORD_RE.findall(text.lower()))
+    if any(c in SPANISH_CHARS for c in text) or not SPANISH_WORDS.isdisjoint(words):
         return "es"
     return None
 
 
+# Script detection only needs the start of a message
+LANGUAGE_DETECT_PREFIX = 64
+
+
+@lru_cache(maxsize=1024)
+def _detect_cached(prefix: str) -> Optional[str]:
+    """Cached language detection keyed on a message prefix."""
+    return detect_input_language(prefix)
+
+
+def detect_message_language(message: str) -> Optional[str]:
+    """Detect the language of a chat message, reusing results for repeated openers."""
+    return _detect_cached(message[:LANGUAGE_DETECT_PREFIX])
+
+
+def start_auto_learn(message: str):
+    """Queue a message for background personal-fact extraction."""
+    auto_learner = get_auto_learner()
+    if auto_learner:
+        auto_learner.submit(message)
+
+
 # Mode information
 MODE_INFO = {
     "chat": {
@@ -82,9 +106,12 @@ async def chat(request: ChatRequest):
         from ..core.response_parser import parse_response
         
         # Detect language from user input and update sticky language
-        detected_lang = detect_input_language(request.message)
+        detected_lang = detect_message_language(request.message)
         effective_language = detected_lang if detected_lang else request.language
 
+        # Queue for batched auto-learning in the background
+        start_auto_learn(request.message)
+
         # Query RAG for context
         context_chunks = memory_manager.query_memory(request.message) if memory_manager else []
 
@@ -97,7 +124,8 @@ async def chat(request: ChatRequest):
             context_chunks,
             mode=request.mode,
             language=effective_language,
-            history=history
+            history=history,
+            use_cache=True
         )
 
         # Parse response for commands
@@ -106,19 +134,6 @@ async def chat(request: ChatRequest):
         # Log interaction for daily reports
         save_interaction(request.mode, request.message, clean_response)
 
-        # Auto-learning in background
-        if memory_manager:
-            def auto_learn():
-                try:
-                    fact = llm_client.extract_personal_info(request.message)
-                    if fact:
-                        memory_manager.add_memory(fact)
-                except Exception as e:
-                    print(f"[AutoLearn] Error: {e}")
-
-            thread = threading.Thread(target=auto_learn, daemon=True)
-            thread.start()
-
         return ChatResponse(
             response=clean_response,
             mode=commands.get("mode"),
@@ -148,7 +163,7 @@ async def chat_stream(request: ChatRequest):
         try:
             from ..core.response_parser import parse_response
 
-            detected_lang = detect_input_language(request.message)
+            detected_lang = detect_message_language(request.message)
             effective_language = detected_lang if detected_lang else request.language
 
             context_chunks = memory_manager.query_memory(request.message) if memory_manager else []
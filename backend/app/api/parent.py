@@ -2,6 +2,7 @@
 Parent registration and daily reports API endpoints.
 """
 
+import asyncio
 import json
 from datetime import datetime, date
 from pathlib import Path
@@ -13,17 +14,39 @@ from ..models import ParentProfile, DailyReport
 from ..config import DATA_DIR
 from ..core.dependencies import get_llm_client, get_memory_manager
 from ..services.email import send_report_email
+from ..services.interactions import get_today_interactions
 
 router = APIRouter()
 
 # File paths for persistent storage
 PARENT_PROFILE_FILE = DATA_DIR / "parent_profile.json"
-INTERACTIONS_FILE = DATA_DIR / "daily_interactions.json"
 REPORTS_FILE = DATA_DIR / "daily_reports.json"
 
+# Static instructions appended to the daily report prompt
+REPORT_PROMPT_SUFFIX = """
+
+Create a JSON response with:
+- summary: 2-3 sentence overview of today's learning
+- topics_discussed: list of main topics (max 5)
+- skills_practiced: list of skills worked on (max 3)
+- mood: one of "happy", "curious", "calm", "energetic"
+- recommendations: 2 suggestions for parents (max 2)
+
+Keep it positive and encouraging. Focus on learning achievements."""
+
+# Interactions per summarization batch for large daily reports
+REPORT_BATCH_SIZE = 20
+
+# Token budget for the final JSON report
+REPORT_MAX_TOKENS = 500
+
+REPORT_BATCH_PROMPT = """Summarize what the child talked about and practiced in these interactions in one or two sentences.
+
+Interactions:
+"""
+
 # In-memory storage (loaded from files)
 _parent_profile: Optional[dict] = None
-_daily_interactions: list = []
 
 
 def load_parent_profile():
@@ -129,6 +152,40 @@ async def update_parent_profile(updates: dict):
     return {"success": True}
 
 
+def _format_interactions(interactions: list) -> str:
+    """Format interactions as prompt lines."""
+    return "\n".join(
+        f"- [{i['mode']}] User: {i['user_message'][:100]}... Bot: {i['bot_response'][:100]}..."
+        for i in interactions
+    )
+
+
+async def _summarize_interactions(llm_client, interactions: list) -> str:
+    """
+    Condense a day's interactions into report input.
+    
+    Small days are listed directly. Larger days are split into batches that
+    are summarized concurrently, so the final prompt stays small.
+    """
+    if len(interactions) <= REPORT_BATCH_SIZE:
+        return _format_interactions(interactions)
+    
+    batches = [
+        interactions[i:i + REPORT_BATCH_SIZE]
+        for i in range(0, len(interactions), REPORT_BATCH_SIZE)
+    ]
+    summaries = await asyncio.gather(*(
+        asyncio.to_thread(llm_client.summarize, REPORT_BATCH_PROMPT + _format_interactions(batch))
+        for batch in batches
+    ))
+    
+    # Failed batches are dropped; if none succeeded, list the latest interactions
+    summaries = [summary for summary in summaries if summary]
+    if not summaries:
+        return _format_interactions(interactions[-REPORT_BATCH_SIZE:])
+    return "\n".join(f"- {summary}" for summary in summaries)
+
+
 @router.get("/reports")
 async def get_daily_reports(limit: int = 7):
     """Get recent daily reports."""
@@ -147,8 +204,6 @@ async def get_daily_reports(limit: int = 7):
 @router.post("/reports/generate")
 async def generate_daily_report(background_tasks: BackgroundTasks):
     """Generate a daily report for today's interactions."""
-    global _daily_interactions
-    
     llm_client = get_llm_client()
     parent_profile = get_parent_profile_data()
     
@@ -156,47 +211,29 @@ async def generate_daily_report(background_tasks: BackgroundTasks):
         raise HTTPException(status_code=404, detail="No parent profile found")
     
     # Load interactions
-    if INTERACTIONS_FILE.exists():
-        try:
-            with open(INTERACTIONS_FILE, 'r') as f:
-                data = json.load(f)
-                today = date.today().isoformat()
-                _daily_interactions = [i for i in data if i.get('date') == today]
-        except:
-            pass
+    daily_interactions = get_today_interactions()
     
-    if not _daily_interactions:
+    if not daily_interactions:
         return {"success": False, "message": "No interactions to report"}
     
     # Generate report using LLM
     child_name = parent_profile.get("child_name", "Your child")
     
-    # Prepare interaction summary
-    interaction_summary = "\n".join([
-        f"- [{i['mode']}] User: {i['user_message'][:100]}... Bot: {i['bot_response'][:100]}..."
-        for i in _daily_interactions[-20:]
-    ])
-    
-    prompt = f"""Generate a brief, warm daily learning report for a parent about their child {child_name}.
-
-Today's interactions:
-{interaction_summary}
-
-Create a JSON response with:
-- summary: 2-3 sentence overview of today's learning
-- topics_discussed: list of main topics (max 5)
-- skills_practiced: list of skills worked on (max 3)
-- mood: one of "happy", "curious", "calm", "energetic"
-- recommendations: 2 suggestions for parents (max 2)
-
-Keep it positive and encouraging. Focus on learning achievements."""
-
     try:
-        response = llm_client.get_response(prompt, [], mode="chat")
+        # Prepare interaction summary
+        interaction_summary = await _summarize_interactions(llm_client, daily_interactions)
+        
+        prompt = (
+            f"Generate a brief, warm daily learning report for a parent about their child {child_name}."
+            f"\n\nToday's interactions:\n{interaction_summary}{REPORT_PROMPT_SUFFIX}"
+        )
+        
+        # Parent-facing call: no robot persona, tags or response cache
+        response = await asyncio.to_thread(llm_client.summarize, prompt, REPORT_MAX_TOKENS)
         
-        # Parse JSON from response
+        # Parse JSON from response (falls back to a default report on failure)
         import re
-        json_match = re.search(r'\{.*\}', response, re.DOTALL)
+        json_match = re.search(r'\{.*\}', response, re.DOTALL) if response else None
         if json_match:
             report_data = json.loads(json_match.group())
         else:
@@ -217,8 +254,8 @@ Keep it positive and encouraging. Focus on learning achievements."""
             "skills_practiced": report_data.get("skills_practiced", []),
             "mood": report_data.get("mood", "happy"),
             "recommendations": report_data.get("recommendations", []),
-            "interaction_count": len(_daily_interactions),
-            "total_minutes": len(_daily_interactions) * 2,
+            "interaction_count": len(daily_interactions),
+            "total_minutes": len(daily_interactions) * 2,
         }
         
         # Save report
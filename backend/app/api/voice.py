@@ -2,15 +2,17 @@
 Voice API endpoints (TTS, STT, verification).
 """
 
+import asyncio
 import os
 import tempfile
 import subprocess
+import threading
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException, UploadFile, File
 from fastapi.responses import StreamingResponse
 
-from ..core.dependencies import get_voice_gatekeeper
+from ..core.dependencies import get_config, get_voice_gatekeeper
 
 router = APIRouter()
 
@@ -60,6 +62,43 @@ STT_LANGUAGES = {
 }
 
 
+# Local Whisper models (faster-whisper), loaded on first use
+_whisper_models = {}
+_whisper_lock = threading.Lock()
+
+
+def load_whisper_model(model_size: str):
+    """Load a faster-whisper model once per size. Returns None if unavailable."""
+    with _whisper_lock:
+        if model_size not in _whisper_models:
+            try:
+                from faster_whisper import WhisperModel
+                # int8 CTranslate2 weights keep CPU inference fast
+                _whisper_models[model_size] = WhisperModel(model_size, device="cpu", compute_type="int8")
+                print(f"[Transcribe] Loaded Whisper model: {model_size}")
+            except ImportError:
+                print("[Transcribe] faster-whisper not installed, using Google STT")
+                _whisper_models[model_size] = None
+            except Exception as e:
+                print(f"[Transcribe] Could not load Whisper model: {e}")
+                _whisper_models[model_size] = None
+        return _whisper_models[model_size]
+
+
+def transcribe_with_whisper(audio_path: str, language: Optional[str], model_size: str) -> Optional[str]:
+    """Transcribe locally with Whisper. Returns None if Whisper is unavailable or fails."""
+    model = load_whisper_model(model_size)
+    if model is None:
+        return None
+    
+    try:
+        segments, _ = model.transcribe(audio_path, language=language, beam_size=1, vad_filter=True)
+        return "".join(segment.text for segment in segments).strip()
+    except Exception as e:
+        print(f"[Transcribe] Whisper failed, using Google STT: {e}")
+        return None
+
+
 @router.post("/voice/transcribe")
 async def transcribe_audio(audio: UploadFile = File(...), language: Optional[str] = None):
     """
@@ -111,6 +150,22 @@ async def transcribe_audio(audio: UploadFile = File(...), language: Optional[str
                 print(f"[Transcribe] Conversion error: {e}")
                 wav_path = tmp_path
         
+        # Local Whisper avoids the round-trip to Google when enabled
+        audio_config = (get_config() or {}).get("audio", {})
+        if audio_config.get("stt_backend") == "whisper":
+            whisper_lang = language if language in STT_LANGUAGES else None
+            text = await asyncio.to_thread(
+                transcribe_with_whisper,
+                wav_path,
+                whisper_lang,
+                audio_config.get("whisper_model", "base")
+            )
+            if text is not None:
+                if not text:
+                    return {"text": "", "success": False, "error": "Could not understand audio"}
+                print(f"[Transcribe] Whisper | Language: {whisper_lang or 'auto'} | Text: {text}")
+                return {"text": text, "success": True}
+        
         recognizer = sr.Recognizer()
         
         try:
@@ -157,7 +212,8 @@ async def verify_voice(audio: UploadFile = File(...)):
         tmp_path = tmp.name
     
     try:
-        is_owner = voice_gatekeeper.verify_user(tmp_path) if voice_gatekeeper else True
+        # Encoder inference is CPU-bound; keep it off the event loop
+        is_owner = await asyncio.to_thread(voice_gatekeeper.verify_user, tmp_path) if voice_gatekeeper else True
         return {"verified": is_owner}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
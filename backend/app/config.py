@@ -2,7 +2,9 @@
 Configuration management for KidBot backend.
 """
 
+import copy
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -17,6 +19,16 @@ BASE_DIR = Path(__file__).parent.parent.parent
 CONFIG_DIR = BASE_DIR / "config"
 DATA_DIR = BASE_DIR / "data"
 
+# Prefer libyaml's C loader when available
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=8)
+def _read_config_file(path: str, mtime_ns: int) -> dict:
+    """Parse a YAML config file. Cached until the file's mtime changes."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=YAML_LOADER) or {}
+
 
 def load_config(config_path: Optional[Path] = None) -> dict:
     """
@@ -38,8 +50,8 @@ def load_config(config_path: Optional[Path] = None) -> dict:
         return apply_env_overrides(get_default_config())
     
     print(f"[Config] Found config at: {config_path}")
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
+    # Callers mutate the result, so hand out a copy of the cached parse
+    config = copy.deepcopy(_read_config_file(str(config_path), config_path.stat().st_mtime_ns))
     
     # Resolve relative paths to absolute
     if "paths" in config:
@@ -95,11 +107,25 @@ def get_default_config() -> dict:
             "model": os.getenv("DEEPSEEK_MODEL", "deepseek-chat"),
             "temperature": 0.7,
             "max_tokens": 500,
-            "api_key": os.getenv("DEEPSEEK_API_KEY")
+            "api_key": os.getenv("DEEPSEEK_API_KEY"),
+            "response_cache": {
+                "enabled": False,
+                "max_entries": 512,
+                "similarity_threshold": 0.95
+            }
+        },
+        "auto_learn": {
+            "batch_size": 4,
+            "flush_seconds": 10.0
+        },
+        "audio": {
+            "stt_backend": "google",
+            "whisper_model": "base"
         },
         "rag": {
             "collection_name": "kidbot_memory",
-            "embedding_model": "all-MiniLM-L6-v2"
+            "embedding_model": "all-MiniLM-L6-v2",
+            "quantize_embeddings": False
         },
         "paths": {
             "raw_docs": str(DATA_DIR / "raw_docs"),
@@ -108,7 +134,8 @@ def get_default_config() -> dict:
         },
         "voice": {
             "enabled": False,  # Disabled by default in production
-            "verification_threshold": 0.75
+            "verification_threshold": 0.75,
+            "min_speech_seconds": 0.3  # Shorter clips (after silence trim) are rejected
         }
     }
 
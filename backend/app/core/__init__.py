@@ -7,6 +7,7 @@ from .dependencies import (
     get_memory_manager,
     get_voice_gatekeeper,
     get_config,
+    get_auto_learner,
 )
 
 __all__ = [
@@ -14,4 +15,5 @@ __all__ = [
     "get_memory_manager", 
     "get_voice_gatekeeper",
     "get_config",
+    "get_auto_learner",
 ]
@@ -2,6 +2,7 @@
 Dependency injection and global state management.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 # Global instances (initialized on startup)
@@ -9,39 +10,67 @@ _config: Optional[dict] = None
 _llm_client = None
 _memory_manager = None
 _voice_gatekeeper = None
+_auto_learner = None
+
+
+def _create_service(label: str, factory, config: dict):
+    """Construct one service, logging success or failure."""
+    try:
+        service = factory(config)
+        print(f"[Dependencies] {label} initialized")
+        return service
+    except Exception as e:
+        print(f"[Dependencies] {label} failed: {e}")
+        return None
+
+
+def _create_voice_gatekeeper(config: dict):
+    """Create the voice gatekeeper and load its encoder so the first verification is fast."""
+    from .voice_security import VoiceGatekeeper
+    gatekeeper = VoiceGatekeeper(config)
+    try:
+        gatekeeper.warm_up()
+    except Exception as e:
+        print(f"[Dependencies] Voice warm-up failed: {e}")
+    return gatekeeper
 
 
 def init_dependencies(config: dict):
     """Initialize all dependencies with config."""
-    global _config, _llm_client, _memory_manager, _voice_gatekeeper
+    global _config, _llm_client, _memory_manager, _voice_gatekeeper, _auto_learner
     
     _config = config
     
     # Import here to avoid circular imports
     from .llm_client import DeepSeekClient
-    from .memory import MemoryManager
-    from .voice_security import VoiceGatekeeper
+    from .memory import MemoryManager, configure_torch_threads
     
-    # Initialize LLM client
-    try:
-        _llm_client = DeepSeekClient(config)
-        print("[Dependencies] LLM client initialized")
-    except Exception as e:
-        print(f"[Dependencies] LLM client failed: {e}")
+    # Torch thread pools are process-wide and must be set before any model
+    # runs, so pin them before the services below start loading in parallel
+    encode_threads = config.get("rag", {}).get("encode_threads")
+    if encode_threads:
+        configure_torch_threads(int(encode_threads))
     
-    # Initialize memory manager
-    try:
-        _memory_manager = MemoryManager(config)
-        print("[Dependencies] Memory manager initialized")
-    except Exception as e:
-        print(f"[Dependencies] Memory manager failed: {e}")
+    # Services are independent, so load their models concurrently
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        llm_future = executor.submit(_create_service, "LLM client", DeepSeekClient, config)
+        memory_future = executor.submit(_create_service, "Memory manager", MemoryManager, config)
+        voice_future = executor.submit(_create_service, "Voice gatekeeper", _create_voice_gatekeeper, config)
+        _llm_client = llm_future.result()
+        _memory_manager = memory_future.result()
+        _voice_gatekeeper = voice_future.result()
     
-    # Initialize voice gatekeeper
-    try:
-        _voice_gatekeeper = VoiceGatekeeper(config)
-        print("[Dependencies] Voice gatekeeper initialized")
-    except Exception as e:
-        print(f"[Dependencies] Voice gatekeeper failed: {e}")
+    # Initialize auto-learn batcher (needs both LLM and memory)
+    if _llm_client and _memory_manager:
+        from ..services.auto_learn import AutoLearner
+        auto_learn_config = config.get("auto_learn", {})
+        _auto_learner = AutoLearner(
+            _llm_client,
+            _memory_manager,
+            batch_size=auto_learn_config.get("batch_size", 4),
+            flush_seconds=auto_learn_config.get("flush_seconds", 10.0)
+        )
+        print("[Dependencies] Auto-learner initialized")
     
     print("[Dependencies] All services initialized")
 
@@ -64,3 +93,8 @@ def get_memory_manager():
 def get_voice_gatekeeper():
     """Get voice gatekeeper instance."""
     return _voice_gatekeeper
+
+
+def get_auto_learner():
+    """Get auto-learn batcher instance."""
+    return _auto_learner
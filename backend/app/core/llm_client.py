@@ -6,11 +6,15 @@ child-friendly responses with mode-based personalities.
 """
 
 import os
+import re
+import time
 from typing import Generator, Optional
 
 from dotenv import load_dotenv
 from openai import OpenAI
 
+from .response_cache import ResponseCache
+
 # Load environment variables
 load_dotenv()
 
@@ -18,15 +22,29 @@ load_dotenv()
 DEFAULT_TEMPERATURE = 0.7
 DEFAULT_MAX_TOKENS = 500
 EXTRACTION_TEMPERATURE = 0.3
+SUMMARY_TEMPERATURE = 0.3
+
+# End of a sentence plus any closing quotes/brackets. Latin punctuation must be
+# followed by whitespace (so "3.14" is not split) and is not a boundary after a
+# title like "Mr."; CJK punctuation is unambiguous and needs no space.
+SENTENCE_BOUNDARY_RE = re.compile(
+    r'(?<!\bMr)(?<!\bMs)(?<!\bDr)(?<!\bSt)(?<!\bMrs)[.!?]+["\')\]」』]*\s+'
+    r'|[。！？]+["\')\]」』]*\s*'
+)
 
 
 # =============================================================================
 # Mode-Based System Prompts
 # =============================================================================
-MODE_PROMPTS = {
-    "chat": """You are {robot_name}, a friendly companion for a young child.
+# Shared opening for every mode; together with META_INSTRUCTION it forms a
+# prefix that is identical across modes
+PROMPT_HEADER = """You are {robot_name}, a friendly robot companion for a young child.
 
-Personality: {personality}
+Personality: {personality}"""
+
+# Mode-specific instructions, placed after the shared prefix
+MODE_PROMPTS = {
+    "chat": """Right now you are simply chatting with the child.
 
 IMPORTANT: Keep answers extremely concise (1-2 sentences maximum) unless specifically asked for a story or detailed explanation.
 
@@ -41,9 +59,7 @@ Guidelines:
 When context is provided, use it to give accurate, helpful answers.
 If the context doesn't help answer the question, rely on your general knowledge but keep it child-appropriate.""",
 
-    "story": """You are {robot_name} the Storyteller, a magical tale-spinner for children.
-
-Personality: {personality}
+    "story": """Right now you are the Storyteller, a magical tale-spinner for the child.
 
 Guidelines:
 - Create short, imaginative fairy tales and adventures for kids
@@ -58,9 +74,7 @@ If the child hasn't requested a specific story, ask: "What kind of story would y
 
 When context is provided, weave those details naturally into your stories.""",
 
-    "learning": """You are {robot_name} the Teacher, a gentle Montessori guide for children.
-
-Personality: {personality}
+    "learning": """Right now you are the Teacher, a gentle Montessori guide for the child.
 
 IMPORTANT: Follow the Montessori Three Period Lesson when teaching new objects or concepts:
 
@@ -87,9 +101,7 @@ Guidelines:
 
 When context is provided, use it to give accurate, child-friendly information.""",
 
-    "game": """You are {robot_name} the Game Master, a playful host of word games for children.
-
-Personality: {personality}
+    "game": """Right now you are the Game Master, a playful host of word games for the child.
 
 Games you can play:
 - "20 Questions": Think of something, child asks yes/no questions to guess
@@ -162,6 +174,92 @@ RULES:
 5. ALWAYS match the user's language in your response
 ---"""
 
+# Personal-fact extraction instructions (static, so sent as a cacheable system message)
+EXTRACTION_GUIDE = """You analyze statements from a child talking to their robot friend.
+
+Decide whether a statement contains a PERSONAL FACT about the child that would be worth remembering.
+Personal facts include:
+- Likes/dislikes (food, colors, activities, etc.)
+- Family members (names, relationships)
+- School/friends information
+- Achievements or experiences
+- Personal details (birthday, age, pet names, etc.)
+
+Examples:
+- "I love strawberry ice cream!" -> YES|Loves strawberry ice cream
+- "My sister's name is Mia" -> YES|Has a sister named Mia
+- "I lost my first tooth today" -> YES|Lost their first tooth
+- "我有一只小狗叫豆豆" -> YES|Has a puppy named Doudou
+- "Tell me a story about dragons" -> NO
+- "Why is the sky blue?" -> NO"""
+
+BATCH_EXTRACTION_SYSTEM_PROMPT = EXTRACTION_GUIDE + """
+
+You will receive several numbered statements.
+
+Rules:
+1. Respond with exactly one line per statement, in order, starting with its number
+2. If NO personal fact is found, write: <number>: NO
+3. If a personal fact IS found, write: <number>: YES|<summarized fact>"""
+
+BATCH_EXTRACTION_SYSTEM_MESSAGE = {"role": "system", "content": BATCH_EXTRACTION_SYSTEM_PROMPT}
+
+# Neutral system message for parent-facing summaries (no robot persona or tags)
+SUMMARY_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You summarize a young child's conversations with a companion robot for the child's parent. Write in plain English and follow the requested output format exactly."
+}
+
+BATCH_RESULT_RE = re.compile(r'^\s*(\d+)\s*[:.)]\s*(.*)$')
+
+# Cheap prefilter for fact extraction: questions and requests without a
+# first-person word cannot carry a personal fact, so they skip the API call
+FACT_SKIP_STARTS = frozenset({
+    "what", "why", "when", "where", "how", "who", "is", "are", "do", "does",
+    "can", "could", "will", "tell", "play", "sing", "let's", "lets",
+    "qué", "que", "por", "cómo", "como", "dónde", "cuándo", "quién", "cuéntame",
+})
+FACT_PRONOUNS = frozenset({
+    "i", "my", "mine", "me", "i'm", "im", "i've", "ive",
+    "yo", "mi", "mis", "tengo",
+})
+FACT_TOKEN_RE = re.compile(r"[\w']+")
+KANA_RE = re.compile(r'[\u3040-\u30ff]')
+HAN_RE = re.compile(r'[\u4e00-\u9fff]')
+
+
+def is_fact_candidate(text: str) -> bool:
+    """Return False for messages that cannot contain a personal fact."""
+    stripped = text.strip()
+    # Japanese often drops pronouns, so only very short messages are skipped
+    if KANA_RE.search(stripped):
+        return len(stripped) >= 4
+    # Chinese personal facts almost always use 我
+    if HAN_RE.search(stripped):
+        return len(stripped) >= 4 and "我" in stripped
+
+    tokens = FACT_TOKEN_RE.findall(stripped.lower())
+    if len(tokens) < 2 or tokens[0] in FACT_SKIP_STARTS:
+        return False
+    return not FACT_PRONOUNS.isdisjoint(tokens)
+
+
+def parse_fact(result: str) -> Optional[str]:
+    """Return the fact from a "YES|<fact>" extraction answer, or None."""
+    result = result.lstrip()
+    # Compare only the 4-character prefix instead of uppercasing the whole answer
+    if result[:4].upper() != "YES|":
+        return None
+    return result[4:].strip() or None
+
+
+# Error message fragments that indicate an authentication problem
+AUTH_ERROR_KEYS = ("api_key", "unauthorized")
+
+# Connection test settings
+CONNECTION_TEST_TTL = 60  # seconds
+CONNECTION_TEST_TIMEOUT = 2  # seconds
+
 # Mode display info
 MODE_INFO = {
     "chat": {"title": "Chat Time", "subtitle": "Let's talk!"},
@@ -198,54 +296,102 @@ class DeepSeekClient:
         self.robot_name = robot_config.get("name", "VV")
         self.personality = robot_config.get("personality", "friendly and curious")
 
-    def _build_system_prompt(self, mode: str = "chat", language: Optional[str] = None) -> str:
-        """Construct the system prompt for the specified mode."""
-        template = MODE_PROMPTS.get(mode, MODE_PROMPTS["chat"])
-        base_prompt = template.format(
+        # Robot name and personality are fixed, so render each mode's prompt once
+        shared_prefix = PROMPT_HEADER.format(
             robot_name=self.robot_name,
             personality=self.personality
-        )
-        prompt = base_prompt + META_INSTRUCTION
-        if language and language != "en":
-            lang_names = {"zh": "Chinese (中文)", "es": "Spanish (Español)", "ja": "Japanese (日本語)"}
-            lang_name = lang_names.get(language, language)
-            prompt += f"\n\nCRITICAL: The child has been speaking {lang_name}. You MUST respond in {lang_name} unless they explicitly switch to another language (e.g. say 'switch to English' or 'speak English')."
-        return prompt
+        ) + META_INSTRUCTION
+        self._system_prompts = {
+            mode: shared_prefix + "\n\n" + template.format(robot_name=self.robot_name)
+            for mode, template in MODE_PROMPTS.items()
+        }
+        # Message dicts are never mutated, so the system entries can be shared
+        self._system_messages = {
+            mode: {"role": "system", "content": prompt}
+            for mode, prompt in self._system_prompts.items()
+        }
+
+        # Cached result of test_connection
+        self._connection_ok: Optional[bool] = None
+        self._connection_checked_at = 0.0
+
+        # Optional cache for repeated questions (off by default since replies
+        # are sampled at a non-zero temperature)
+        cache_config = config.get("llm", {}).get("response_cache", {})
+        self.response_cache = None
+        if cache_config.get("enabled"):
+            rag_config = config.get("rag", {})
+            self.response_cache = ResponseCache(
+                embedding_model_name=rag_config.get("embedding_model", "all-MiniLM-L6-v2"),
+                quantize_embeddings=rag_config.get("quantize_embeddings", False),
+                max_entries=cache_config.get("max_entries", 512),
+                similarity_threshold=cache_config.get("similarity_threshold", 0.95)
+            )
+
+    def _build_system_message(self, mode: str = "chat") -> dict:
+        """Get the shared system message for the specified mode."""
+        return self._system_messages.get(mode, self._system_messages["chat"])
+
+    def _build_language_note(self, language: Optional[str] = None) -> Optional[str]:
+        """Build the sticky-language reminder, or None for English."""
+        if not language or language == "en":
+            return None
+        lang_names = {"zh": "Chinese (中文)", "es": "Spanish (Español)", "ja": "Japanese (日本語)"}
+        lang_name = lang_names.get(language, language)
+        return f"CRITICAL: The child has been speaking {lang_name}. You MUST respond in {lang_name} unless they explicitly switch to another language (e.g. say 'switch to English' or 'speak English')."
 
     def _build_messages(
         self,
-        system_prompt: str,
+        system_message: dict,
         user_input: str,
         context_chunks: Optional[list[str]] = None,
-        history: Optional[list[dict]] = None
+        history: Optional[list[dict]] = None,
+        language: Optional[str] = None
     ) -> list[dict]:
-        """Build the messages array with system prompt, history, and current message."""
-        messages = [{"role": "system", "content": system_prompt}]
+        """
+        Build the messages array with system prompt, history, and current message.
+        
+        Content is ordered from most to least stable (system prompt, language,
+        history, RAG context, user input) so the provider's prompt prefix cache
+        can reuse as much of the request as possible between turns.
+        """
+        messages = [system_message]
+
+        language_note = self._build_language_note(language)
+        if language_note:
+            messages.append({"role": "system", "content": language_note})
 
         # Add conversation history (last 10 turns max to stay within token limits)
         if history:
             for msg in history[-10:]:
                 messages.append({"role": msg["role"], "content": msg["content"]})
 
-        # Build current user message with RAG context
+        # RAG context changes every turn, so it goes right before the user message
         if context_chunks:
-            context_section = self._format_context(context_chunks)
-            full_message = f"{user_input}{context_section}"
-        else:
-            full_message = user_input
+            messages.append({"role": "system", "content": self._format_context(context_chunks)})
 
-        messages.append({"role": "user", "content": full_message})
+        messages.append({"role": "user", "content": user_input})
         return messages
 
+    def _prepare_messages(
+        self,
+        user_input: str,
+        context_chunks: Optional[list[str]] = None,
+        mode: str = "chat",
+        language: Optional[str] = None,
+        history: Optional[list[dict]] = None
+    ) -> list[dict]:
+        """Build the full request messages for a chat turn."""
+        return self._build_messages(
+            self._build_system_message(mode), user_input, context_chunks, history, language
+        )
+
     def _format_context(self, context_chunks: list[str]) -> str:
         """Format context chunks into a readable string."""
         if not context_chunks:
             return ""
-        context_text = "\n\n".join(
-            f"[Info {i+1}]: {chunk}"
-            for i, chunk in enumerate(context_chunks)
-        )
-        return f"\n\n[Context from my memory]:\n{context_text}"
+        parts = [f"[Info {i}]: {chunk}" for i, chunk in enumerate(context_chunks, 1)]
+        return "[Context from my memory]:\n" + "\n\n".join(parts)
 
     def get_response(
         self,
@@ -253,11 +399,24 @@ class DeepSeekClient:
         context_chunks: Optional[list[str]] = None,
         mode: str = "chat",
         language: Optional[str] = None,
-        history: Optional[list[dict]] = None
+        history: Optional[list[dict]] = None,
+        use_cache: bool = False
     ) -> str:
-        """Get a response from DeepSeek for the user's input."""
-        system_prompt = self._build_system_prompt(mode, language)
-        messages = self._build_messages(system_prompt, user_input, context_chunks, history)
+        """
+        Get a response from DeepSeek for the user's input.
+        
+        Pass use_cache=True only for child chat turns; other prompts (such as
+        daily reports) must never be answered from the response cache.
+        """
+        # Only standalone questions are cacheable; history changes the answer
+        use_cache = use_cache and self.response_cache is not None and not history
+        query_embedding = None
+        if use_cache:
+            cached, query_embedding = self.response_cache.get(user_input, mode, language, context_chunks)
+            if cached is not None:
+                return cached
+
+        messages = self._prepare_messages(user_input, context_chunks, mode, language, history)
 
         try:
             response = self.client.chat.completions.create(
@@ -267,18 +426,32 @@ class DeepSeekClient:
                 max_tokens=DEFAULT_MAX_TOKENS,
                 stream=False
             )
-            return response.choices[0].message.content.strip()
+            # Whitespace is trimmed by parse_response at the edge
+            content = response.choices[0].message.content
+            if use_cache:
+                self.response_cache.put(
+                    user_input, mode, content, language, context_chunks, embedding=query_embedding
+                )
+            return content
         except Exception as e:
             return self._handle_api_error(e)
 
     def _handle_api_error(self, error: Exception, for_stream: bool = False) -> str:
         """Handle API errors with user-friendly messages."""
-        error_msg = str(error).lower()
         print(f"[LLM] API Error: {error}")
 
-        if "api_key" in error_msg or "unauthorized" in error_msg:
+        # OpenAI SDK status errors carry the HTTP code; fall back to the message
+        status_code = getattr(error, "status_code", None)
+        if status_code is None:
+            error_msg = str(error).casefold()
+            if any(key in error_msg for key in AUTH_ERROR_KEYS):
+                status_code = 401
+            elif "rate" in error_msg:
+                status_code = 429
+
+        if status_code in (401, 403):
             return "Oops! I can't connect to my brain right now."
-        elif "rate" in error_msg:
+        elif status_code == 429:
             return "Whoa, I'm thinking too fast! Let's slow down."
         else:
             return "Hmm, my brain got a little confused. Can you say that again?"
@@ -289,11 +462,17 @@ class DeepSeekClient:
         context_chunks: Optional[list[str]] = None,
         mode: str = "chat",
         language: Optional[str] = None,
-        history: Optional[list[dict]] = None
+        history: Optional[list[dict]] = None,
+        by_sentence: bool = False
     ) -> Generator[str, None, None]:
-        """Stream response from DeepSeek for lower latency."""
-        system_prompt = self._build_system_prompt(mode, language)
-        messages = self._build_messages(system_prompt, user_input, context_chunks, history)
+        """
+        Stream response from DeepSeek for lower latency.
+        
+        With by_sentence=True, tokens are buffered and yielded one or more
+        complete sentences at a time, ready to hand to TTS.
+        """
+        messages = self._prepare_messages(user_input, context_chunks, mode, language, history)
+        pending = ""
 
         try:
             stream = self.client.chat.completions.create(
@@ -305,63 +484,100 @@ class DeepSeekClient:
             )
 
             for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+                content = chunk.choices[0].delta.content
+                if not content:
+                    continue
+                if not by_sentence:
+                    yield content
+                    continue
+
+                pending += content
+                sentence_end = 0
+                for match in SENTENCE_BOUNDARY_RE.finditer(pending):
+                    # A boundary at the very end may still grow (closing quote,
+                    # more spaces), so wait for the next delta before flushing it
+                    if match.end() < len(pending):
+                        sentence_end = match.end()
+                if sentence_end:
+                    yield pending[:sentence_end]
+                    pending = pending[sentence_end:]
+
+            if pending:
+                yield pending
 
         except Exception as e:
+            if pending:
+                yield pending
             yield self._handle_api_error(e, for_stream=True)
 
     def extract_personal_info(self, user_text: str) -> Optional[str]:
         """Analyze user text and extract personal information worth remembering."""
-        extraction_prompt = """Analyze this statement from a child talking to their robot friend.
-
-Does this statement contain a PERSONAL FACT about the child that would be worth remembering?
-Personal facts include:
-- Likes/dislikes (food, colors, activities, etc.)
-- Family members (names, relationships)
-- School/friends information
-- Achievements or experiences
-- Personal details (birthday, age, pet names, etc.)
+        if not is_fact_candidate(user_text):
+            return None
 
-Statement: "{text}"
+        return self.extract_personal_info_batch([user_text])[0]
 
-Rules:
-1. If NO personal fact is found, respond with exactly: NO
-2. If a personal fact IS found, respond with exactly: YES|<summarized fact>
+    def extract_personal_info_batch(self, texts: list[str]) -> list[Optional[str]]:
+        """Extract personal facts from several statements with a single API call."""
+        facts: list[Optional[str]] = [None] * len(texts)
+        if not texts:
+            return facts
 
-Your response (NO or YES|fact):"""
+        statements = "\n".join(f'{i}: "{text}"' for i, text in enumerate(texts, 1))
 
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "user", "content": extraction_prompt.format(text=user_text)}
+                    BATCH_EXTRACTION_SYSTEM_MESSAGE,
+                    {"role": "user", "content": f"Statements:\n{statements}"}
                 ],
                 temperature=EXTRACTION_TEMPERATURE,
-                max_tokens=100
+                max_tokens=60 * len(texts)
             )
 
-            result = response.choices[0].message.content.strip()
+            for line in response.choices[0].message.content.splitlines():
+                match = BATCH_RESULT_RE.match(line)
+                if not match:
+                    continue
+                index = int(match.group(1)) - 1
+                fact = parse_fact(match.group(2))
+                if fact and 0 <= index < len(texts):
+                    facts[index] = fact
+                    print(f"[AutoLearn] Extracted fact: {fact}")
 
-            if result.upper().startswith("YES|"):
-                fact = result[4:].strip()
-                print(f"[AutoLearn] Extracted fact: {fact}")
-                return fact
-            return None
+        except Exception as e:
+            print(f"[AutoLearn] Batch extraction error: {e}")
 
+        return facts
+
+    def summarize(self, text: str, max_tokens: int = 150) -> Optional[str]:
+        """Run a plain summarization request. Returns None on failure."""
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[SUMMARY_SYSTEM_MESSAGE, {"role": "user", "content": text}],
+                temperature=SUMMARY_TEMPERATURE,
+                max_tokens=max_tokens
+            )
+            return response.choices[0].message.content.strip()
         except Exception as e:
-            print(f"[AutoLearn] Extraction error: {e}")
+            print(f"[LLM] Summary error: {e}")
             return None
 
     def test_connection(self) -> bool:
-        """Test if the API connection is working."""
+        """Test if the API connection is working (result cached briefly)."""
+        now = time.monotonic()
+        if self._connection_ok is not None and now - self._connection_checked_at < CONNECTION_TEST_TTL:
+            return self._connection_ok
+
         try:
-            self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": "Say 'hello' in one word."}],
-                max_tokens=10
-            )
-            return True
+            # Listing models checks the key and endpoint without billing a completion
+            self.client.with_options(timeout=CONNECTION_TEST_TIMEOUT).models.list()
+            self._connection_ok = True
         except Exception as e:
             print(f"Connection test failed: {e}")
-            return False
+            self._connection_ok = False
+
+        self._connection_checked_at = now
+        return self._connection_ok
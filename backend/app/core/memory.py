@@ -5,6 +5,8 @@ Handles document ingestion and semantic search using ChromaDB.
 """
 
 import json
+import threading
+import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -20,12 +22,44 @@ _embedding_model_cache = {}
 _chroma_client_cache = {}
 
 
-def load_embedding_model(model_name: str) -> SentenceTransformer:
-    """Load and cache the sentence transformer embedding model."""
-    if model_name not in _embedding_model_cache:
+def load_embedding_model(model_name: str, quantize: bool = False) -> SentenceTransformer:
+    """
+    Load and cache the sentence transformer embedding model.
+    
+    With quantize=True on a CPU host, the transformer's Linear layers are
+    dynamically quantized to int8, roughly doubling encode throughput.
+    """
+    cache_key = (model_name, quantize)
+    if cache_key not in _embedding_model_cache:
         print(f"[Cache] Loading embedding model: {model_name}...")
-        _embedding_model_cache[model_name] = SentenceTransformer(model_name)
-    return _embedding_model_cache[model_name]
+        model = SentenceTransformer(model_name)
+        if quantize and model.device.type == "cpu":
+            try:
+                import torch
+                transformer = model._first_module()
+                transformer.auto_model = torch.quantization.quantize_dynamic(
+                    transformer.auto_model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+                print("[Cache] Quantized embedding model to int8")
+            except Exception as e:
+                print(f"[Cache] Quantization failed, using fp32 model: {e}")
+        _embedding_model_cache[cache_key] = model
+    return _embedding_model_cache[cache_key]
+
+
+def configure_torch_threads(num_threads: int):
+    """Pin PyTorch intra-op threads for CPU encoding and disable inter-op parallelism."""
+    try:
+        import torch
+        torch.set_num_threads(num_threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Can only be set before any inter-op work has started
+            pass
+        print(f"[Cache] Torch using {num_threads} intra-op threads")
+    except ImportError:
+        pass
 
 
 def get_chroma_client(vector_store_path: str) -> chromadb.PersistentClient:
@@ -58,13 +92,18 @@ class MemoryManager:
         # Collection settings
         self.collection_name = rag_config.get("collection_name", "kidbot_memory")
         self.embedding_model_name = rag_config.get("embedding_model", "all-MiniLM-L6-v2")
+        self.quantize_embeddings = rag_config.get("quantize_embeddings", False)
 
         # Use cached ChromaDB client
         self.client = get_chroma_client(str(self.vector_store_path))
         self.collection = self._get_or_create_collection()
 
+        # Document count tracked locally so stats skip a COUNT(*) round-trip
+        self._doc_count = self.collection.count()
+        self._count_lock = threading.Lock()
+
         # Use cached embedding model
-        self.embedding_model = load_embedding_model(self.embedding_model_name)
+        self.embedding_model = load_embedding_model(self.embedding_model_name, self.quantize_embeddings)
 
         # Load processed files registry
         self.processed_files = self._load_processed_files()
@@ -97,13 +136,13 @@ class MemoryManager:
 
     def query_memory(self, query_text: str, n_results: int = 3) -> list[str]:
         """Search the knowledge base for relevant context."""
-        if self.collection.count() == 0:
-            return []
-
         try:
+            # Encode with the same model as add_memory so queries and stored
+            # memories share one embedding space (and the int8 speedup)
+            query_embedding = self.embedding_model.encode([query_text], show_progress_bar=False).tolist()
             results = self.collection.query(
-                query_texts=[query_text],
-                n_results=min(n_results, self.collection.count())
+                query_embeddings=query_embedding,
+                n_results=n_results
             )
 
             if results and results["documents"]:
@@ -120,8 +159,7 @@ class MemoryManager:
             return False
 
         try:
-            current_count = self.collection.count()
-            doc_id = f"memory_{current_count}"
+            doc_id = f"memory_{uuid.uuid4().hex}"
 
             if metadata is None:
                 metadata = {}
@@ -141,6 +179,9 @@ class MemoryManager:
                 metadatas=[metadata]
             )
 
+            with self._count_lock:
+                self._doc_count += 1
+
             print(f"[Memory] Saved new memory: {text[:50]}...")
             return True
 
@@ -151,7 +192,7 @@ class MemoryManager:
     def get_stats(self) -> dict:
         """Get statistics about the knowledge base."""
         return {
-            "total_documents": self.collection.count(),
+            "total_documents": self._doc_count,
             "processed_files": len(self.processed_files),
             "collection_name": self.collection_name
         }
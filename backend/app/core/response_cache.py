@@ -0,0 +1,142 @@
+"""
+Response Cache for KidBot
+
+Caches LLM replies for repeated child questions ("tell me a joke",
+"what is an apple") so they skip the API round-trip. Lookups first try an
+exact match on the normalized question, then a semantic match using the
+same sentence embedding model as the memory system.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+# Default settings
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_SIMILARITY_THRESHOLD = 0.95
+
+
+class ResponseCache:
+    """In-process exact + semantic cache for LLM responses."""
+
+    def __init__(
+        self,
+        embedding_model_name: Optional[str] = None,
+        quantize_embeddings: bool = False,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD
+    ):
+        """Initialize the cache. Semantic matching is skipped if no model name is given."""
+        self.embedding_model_name = embedding_model_name
+        self.quantize_embeddings = quantize_embeddings
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+
+        self._exact: OrderedDict[str, str] = OrderedDict()
+        # Semantic entries: partition key, normalized embedding, response
+        self._partitions: list[str] = []
+        self._embeddings = None
+        self._responses: list[str] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _partition_key(mode: str, language: Optional[str], context_chunks: Optional[list[str]]) -> str:
+        """Key for everything besides the question that shapes the answer."""
+        context_hash = hashlib.sha1("\x00".join(context_chunks or []).encode("utf-8")).hexdigest()
+        return f"{mode}|{language or ''}|{context_hash}"
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Normalize a question for exact matching."""
+        return " ".join(text.lower().split())
+
+    def _embed(self, text: str):
+        """Embed a question, or return None if semantic matching is unavailable."""
+        if not self.embedding_model_name:
+            return None
+        try:
+            # Import here to avoid loading ChromaDB when the cache is unused
+            from .memory import load_embedding_model
+            model = load_embedding_model(self.embedding_model_name, self.quantize_embeddings)
+            return model.encode([text], normalize_embeddings=True, show_progress_bar=False)[0]
+        except Exception as e:
+            print(f"[ResponseCache] Embedding error: {e}")
+            return None
+
+    def get(
+        self,
+        user_input: str,
+        mode: str,
+        language: Optional[str] = None,
+        context_chunks: Optional[list[str]] = None
+    ) -> Tuple[Optional[str], Optional[object]]:
+        """
+        Look up a cached response for this question.
+        
+        Returns (response or None, query embedding). Pass the embedding to
+        put() after a miss so the question is not encoded twice.
+        """
+        partition = self._partition_key(mode, language, context_chunks)
+        exact_key = f"{partition}|{self._normalize(user_input)}"
+
+        with self._lock:
+            if exact_key in self._exact:
+                self._exact.move_to_end(exact_key)
+                return self._exact[exact_key], None
+
+        query = self._embed(user_input)
+        if query is None:
+            return None, None
+
+        with self._lock:
+            if self._embeddings is None:
+                return None, query
+            scores = self._embeddings @ query
+            best_index, best_score = None, self.similarity_threshold
+            for i, score in enumerate(scores):
+                if score >= best_score and self._partitions[i] == partition:
+                    best_index, best_score = i, score
+            if best_index is None:
+                return None, query
+            return self._responses[best_index], query
+
+    def put(
+        self,
+        user_input: str,
+        mode: str,
+        response: str,
+        language: Optional[str] = None,
+        context_chunks: Optional[list[str]] = None,
+        embedding=None
+    ):
+        """Store a response for this question, reusing the embedding from get() if given."""
+        import numpy as np
+
+        partition = self._partition_key(mode, language, context_chunks)
+        exact_key = f"{partition}|{self._normalize(user_input)}"
+        if embedding is None:
+            embedding = self._embed(user_input)
+
+        with self._lock:
+            self._exact[exact_key] = response
+            self._exact.move_to_end(exact_key)
+            if len(self._exact) > self.max_entries:
+                self._exact.popitem(last=False)
+
+            if embedding is None:
+                return
+            row = embedding.astype(np.float32)[np.newaxis, :]
+            if self._embeddings is None:
+                self._embeddings = row
+            else:
+                self._embeddings = np.vstack([self._embeddings, row])
+            self._partitions.append(partition)
+            self._responses.append(response)
+
+            # Drop the oldest semantic entries once full
+            overflow = len(self._responses) - self.max_entries
+            if overflow > 0:
+                self._embeddings = self._embeddings[overflow:]
+                del self._partitions[:overflow]
+                del self._responses[:overflow]
@@ -5,6 +5,11 @@ Response parser for extracting commands from LLM responses.
 import re
 from typing import Tuple, Dict
 
+# Command tags in either <MODE:x> or [[MODE: x]] style
+COMMAND_TAG_RE = re.compile(
+    r'<(MODE|ACTION|LANGUAGE):(\w+)>|\[\[(MODE|ACTION|LANGUAGE):\s*(\w+)\]\]'
+)
+
 
 def parse_response(response: str) -> Tuple[Dict[str, str], str]:
     """
@@ -17,29 +22,36 @@ def parse_response(response: str) -> Tuple[Dict[str, str], str]:
     Returns:
         Tuple of (commands dict, cleaned response text)
     """
+    # Single pass: record the first tag of each kind per style and keep
+    # the text between tags
+    angle_tags = {}
+    bracket_tags = {}
+    parts = []
+    last_end = 0
+    for match in COMMAND_TAG_RE.finditer(response):
+        if match.group(1):
+            angle_tags.setdefault(match.group(1), match.group(2))
+        else:
+            bracket_tags.setdefault(match.group(3), match.group(4))
+        parts.append(response[last_end:match.start()])
+        last_end = match.end()
+    parts.append(response[last_end:])
+    clean_response = "".join(parts)
+    
     commands = {}
-    clean_response = response
-    
-    # Extract MODE commands (both <MODE:x> and [[MODE: x]] styles)
-    mode_match = re.search(r'<MODE:(\w+)>', response) or re.search(r'\[\[MODE:\s*(\w+)\]\]', response)
-    if mode_match:
-        commands['mode'] = mode_match.group(1)
-        clean_response = re.sub(r'<MODE:\w+>', '', clean_response)
-        clean_response = re.sub(r'\[\[MODE:\s*\w+\]\]', '', clean_response)
-
-    # Extract ACTION commands (both <ACTION:x> and [[ACTION: x]] styles)
-    action_match = re.search(r'<ACTION:(\w+)>', response) or re.search(r'\[\[ACTION:\s*(\w+)\]\]', response)
-    if action_match:
-        commands['action'] = action_match.group(1)
-        clean_response = re.sub(r'<ACTION:\w+>', '', clean_response)
-        clean_response = re.sub(r'\[\[ACTION:\s*\w+\]\]', '', clean_response)
-
-    # Extract LANGUAGE commands (both <LANGUAGE:x> and [[LANGUAGE: x]] styles)
-    lang_match = re.search(r'\[\[LANGUAGE:\s*(\w+)\]\]', response) or re.search(r'<LANGUAGE:(\w+)>', response)
-    if lang_match:
-        commands['language'] = lang_match.group(1).lower()
-        clean_response = re.sub(r'\[\[LANGUAGE:\s*\w+\]\]', '', clean_response)
-        clean_response = re.sub(r'<LANGUAGE:\w+>', '', clean_response)
+    
+    # MODE and ACTION prefer <TAG:x>; LANGUAGE prefers [[LANGUAGE: x]]
+    mode = angle_tags.get('MODE') or bracket_tags.get('MODE')
+    if mode:
+        commands['mode'] = mode
+    
+    action = angle_tags.get('ACTION') or bracket_tags.get('ACTION')
+    if action:
+        commands['action'] = action
+    
+    language = bracket_tags.get('LANGUAGE') or angle_tags.get('LANGUAGE')
+    if language:
+        commands['language'] = language.lower()
     
     # Clean up whitespace
     clean_response = clean_response.strip()
@@ -4,11 +4,84 @@ Voice Security / Speaker Verification for KidBot
 Handles voice registration and verification using speaker embeddings.
 """
 
+import hashlib
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional
 
 from ..config import DATA_DIR
 
+# Sample rate expected by the resemblyzer encoder
+ENCODER_SAMPLE_RATE = 16000
+
+# Number of recent audio embeddings kept, keyed by file content hash
+EMBEDDING_CACHE_SIZE = 64
+
+# Clips with less voiced audio than this (after silence trimming) are not embedded
+DEFAULT_MIN_SPEECH_SECONDS = 0.3
+
+
+# Shared encoder instance (one PyTorch model per process)
+_voice_encoder = None
+_voice_encoder_lock = threading.Lock()
+
+
+def load_voice_encoder():
+    """Load and cache the resemblyzer voice encoder. Raises ImportError if not installed."""
+    global _voice_encoder
+    with _voice_encoder_lock:
+        if _voice_encoder is None:
+            from resemblyzer import VoiceEncoder
+            # VoiceEncoder picks CUDA automatically when available
+            encoder = VoiceEncoder()
+            print("[Voice] Loaded voice encoder")
+            
+            # Run one dummy utterance so lazy torch/cuDNN setup happens now
+            try:
+                import numpy as np
+                noise = np.random.default_rng(0).standard_normal(ENCODER_SAMPLE_RATE).astype(np.float32) * 0.01
+                encoder.embed_utterance(noise)
+            except Exception as e:
+                print(f"[Voice] Encoder warm-up failed: {e}")
+            _voice_encoder = encoder
+    return _voice_encoder
+
+
+def _normalize_embedding(embedding):
+    """Return the embedding as a unit-length float32 vector."""
+    import numpy as np
+    embedding = np.asarray(embedding, dtype=np.float32)
+    return embedding / (np.linalg.norm(embedding) + 1e-12)
+
+
+def _preprocess_audio(audio_path: str):
+    """
+    Load and preprocess audio for the voice encoder.
+    
+    On CUDA hosts with torchaudio installed, decoding and resampling run on
+    the GPU so resemblyzer only has to normalize and trim silence. Otherwise
+    falls back to resemblyzer's own librosa-based preprocessing.
+    """
+    from resemblyzer import preprocess_wav
+    
+    try:
+        import torch
+        import torchaudio
+        
+        if torch.cuda.is_available():
+            wav, sample_rate = torchaudio.load(audio_path)
+            wav = wav.to("cuda").mean(dim=0)
+            if sample_rate != ENCODER_SAMPLE_RATE:
+                wav = torchaudio.functional.resample(wav, sample_rate, ENCODER_SAMPLE_RATE)
+            return preprocess_wav(wav.cpu().numpy(), source_sr=ENCODER_SAMPLE_RATE)
+    except ImportError:
+        pass
+    except Exception as e:
+        print(f"[Voice] GPU preprocessing failed, using CPU path: {e}")
+    
+    return preprocess_wav(audio_path)
+
 
 class VoiceGatekeeper:
     """Handles voice verification for KidBot."""
@@ -26,27 +99,91 @@ class VoiceGatekeeper:
         
         self.threshold = voice_config.get("verification_threshold", 0.75)
         self.enabled = voice_config.get("enabled", True)
+        self.min_speech_samples = int(
+            voice_config.get("min_speech_seconds", DEFAULT_MIN_SPEECH_SECONDS) * ENCODER_SAMPLE_RATE
+        )
         
         # Lazy load voice verification model
         self._encoder = None
         self._owner_embedding = None
+        
+        # Embeddings of recently seen audio (retries re-send the same bytes)
+        self._embedding_cache: OrderedDict[bytes, object] = OrderedDict()
+        self._embedding_cache_lock = threading.Lock()
 
     def _load_encoder(self):
         """Lazy load the voice encoder."""
         if self._encoder is None:
             try:
-                from resemblyzer import VoiceEncoder
-                self._encoder = VoiceEncoder()
-                print("[Voice] Loaded voice encoder")
+                self._encoder = load_voice_encoder()
             except ImportError:
                 print("[Voice] resemblyzer not installed, voice verification disabled")
                 self.enabled = False
 
+    def _load_owner_embedding(self):
+        """Load the registered owner embedding from disk if not cached."""
+        if self._owner_embedding is None:
+            import numpy as np
+            owner_file = self.voice_prints_path / "owner_embedding.npy"
+            # Normalize once so each verification is a single dot product
+            self._owner_embedding = _normalize_embedding(np.load(owner_file))
+
+    def _extract_embedding(self, audio_path: str):
+        """
+        Get the normalized embedding for an audio file, reusing it for identical audio.
+        
+        Returns None when the clip has too little speech to embed.
+        """
+        # Read loop rather than hashlib.file_digest, which needs Python 3.11
+        hasher = hashlib.sha256()
+        with open(audio_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 16), b""):
+                hasher.update(block)
+        digest = hasher.digest()
+        
+        with self._embedding_cache_lock:
+            cached = self._embedding_cache.get(digest)
+            if cached is not None:
+                self._embedding_cache.move_to_end(digest)
+                return cached
+        
+        wav = _preprocess_audio(audio_path)
+        
+        # preprocess_wav trims silence, so a short result means no real speech
+        if len(wav) < self.min_speech_samples:
+            return None
+        
+        embedding = _normalize_embedding(self._encoder.embed_utterance(wav))
+        
+        with self._embedding_cache_lock:
+            self._embedding_cache[digest] = embedding
+            if len(self._embedding_cache) > EMBEDDING_CACHE_SIZE:
+                self._embedding_cache.popitem(last=False)
+        return embedding
+
+    def warm_up(self):
+        """Load the encoder and owner embedding ahead of the first request."""
+        if not self.enabled:
+            return
+        
+        self._load_encoder()
+        if self._encoder is None or not self.is_ready():
+            return
+        
+        try:
+            self._load_owner_embedding()
+        except Exception as e:
+            print(f"[Voice] Could not preload owner embedding: {e}")
+
     def is_ready(self) -> bool:
         """Check if voice verification is set up."""
         if not self.enabled:
             return True  # Bypass if disabled
         
+        # Once the voice print is in memory, skip the filesystem check
+        if self._owner_embedding is not None:
+            return True
+        
         owner_file = self.voice_prints_path / "owner_embedding.npy"
         return owner_file.exists()
 
@@ -61,13 +198,15 @@ class VoiceGatekeeper:
             
         try:
             import numpy as np
-            from resemblyzer import preprocess_wav
             
-            wav = preprocess_wav(audio_path)
-            embedding = self._encoder.embed_utterance(wav)
+            # Kept as unit length float32 so verification is a single dot product
+            embedding = self._extract_embedding(audio_path)
+            if embedding is None:
+                print("[Voice] Registration failed: no speech detected")
+                return False
             
-            # Save embedding
-            np.save(self.voice_prints_path / "owner_embedding.npy", embedding)
+            # Save as float16 (half the size; loading casts back to float32)
+            np.save(self.voice_prints_path / "owner_embedding.npy", embedding.astype(np.float16))
             self._owner_embedding = embedding
             
             print("[Voice] Registered owner voice print")
@@ -91,19 +230,18 @@ class VoiceGatekeeper:
             
         try:
             import numpy as np
-            from resemblyzer import preprocess_wav
             
             # Load owner embedding if not cached
-            if self._owner_embedding is None:
-                owner_file = self.voice_prints_path / "owner_embedding.npy"
-                self._owner_embedding = np.load(owner_file)
+            self._load_owner_embedding()
             
             # Get embedding for input audio
-            wav = preprocess_wav(audio_path)
-            test_embedding = self._encoder.embed_utterance(wav)
+            test_embedding = self._extract_embedding(audio_path)
+            if test_embedding is None:
+                print("[Voice] No speech detected, skipping verification")
+                return False
             
-            # Calculate cosine similarity
-            similarity = np.dot(self._owner_embedding, test_embedding)
+            # Cosine similarity of unit vectors
+            similarity = float(np.dot(self._owner_embedding, test_embedding))
             
             print(f"[Voice] Similarity: {similarity:.3f} (threshold: {self.threshold})")
             return similarity >= self.threshold
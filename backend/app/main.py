@@ -4,20 +4,23 @@ KidBot FastAPI Backend
 Main entry point for the FastAPI application.
 """
 
-import threading
+import asyncio
+import hashlib
+import mimetypes
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, Response
 from fastapi.staticfiles import StaticFiles
 
 from .config import load_config
-from .core.dependencies import init_dependencies, get_llm_client, get_memory_manager
+from .core.dependencies import init_dependencies, get_llm_client, get_memory_manager, get_auto_learner
 from .core.response_parser import parse_response
 from .api import api_router
-from .api.chat import detect_input_language
+from .api.chat import detect_message_language, start_auto_learn
 from .api.parent import load_parent_profile, get_parent_profile_data
 from .services.interactions import load_interactions
 from .models import StatusResponse
@@ -41,6 +44,11 @@ async def lifespan(app: FastAPI):
     print("[Backend] KidBot API ready!")
     yield
     print("[Backend] Shutting down...")
+    
+    # Save any facts still waiting in the auto-learn batch
+    auto_learner = get_auto_learner()
+    if auto_learner:
+        await asyncio.to_thread(auto_learner.stop)
 
 
 # Create FastAPI app
@@ -63,13 +71,13 @@ CORS_ORIGINS = [
 # Add production frontend URL if set
 if FRONTEND_URL:
     CORS_ORIGINS.append(FRONTEND_URL)
-# Allow all Render.com subdomains
-CORS_ORIGINS.append("https://*.onrender.com")
+# Allow all Render.com subdomains (allow_origins does not expand wildcards)
+CORS_ORIGIN_REGEX = r"https://.*\.onrender\.com"
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=CORS_ORIGINS,
-    allow_origin_regex=r"https://.*\.onrender\.com",
+    allow_origin_regex=CORS_ORIGIN_REGEX,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -86,9 +94,37 @@ app.include_router(api_router)
 # Path to the built React frontend
 FRONTEND_DIR = Path(__file__).resolve().parent.parent.parent / "frontend" / "dist"
 
-# Mount static assets if frontend is built
+# Mount static assets if frontend is built (gzipped: the JS/CSS bundles compress well)
 if FRONTEND_DIR.is_dir() and (FRONTEND_DIR / "assets").is_dir():
-    app.mount("/assets", StaticFiles(directory=str(FRONTEND_DIR / "assets")), name="static-assets")
+    app.mount(
+        "/assets",
+        GZipMiddleware(StaticFiles(directory=str(FRONTEND_DIR / "assets")), minimum_size=1024),
+        name="static-assets"
+    )
+
+# Root-level static files small enough to keep in memory
+STATIC_CACHE_MAX_BYTES = 64 * 1024
+
+
+def load_static_cache() -> dict[str, bytes]:
+    """Read small root-level frontend files (index.html, manifest, icons) into memory."""
+    cache: dict[str, bytes] = {}
+    if not FRONTEND_DIR.is_dir():
+        return cache
+    for path in FRONTEND_DIR.iterdir():
+        try:
+            if path.is_file() and path.stat().st_size <= STATIC_CACHE_MAX_BYTES:
+                cache[path.name] = path.read_bytes()
+        except OSError as e:
+            print(f"[Static] Could not cache {path.name}: {e}")
+    return cache
+
+
+STATIC_CACHE = load_static_cache()
+
+# ETag for the SPA shell so browsers can revalidate instead of re-downloading
+_index_bytes = STATIC_CACHE.get("index.html")
+INDEX_ETAG = f'"{hashlib.sha256(_index_bytes).hexdigest()[:16]}"' if _index_bytes is not None else None
 
 
 @app.get("/api/status", response_model=StatusResponse)
@@ -166,15 +202,22 @@ async def websocket_chat(websocket: WebSocket):
                 continue
 
             # Detect language from user input
-            detected_lang = detect_input_language(message)
+            detected_lang = detect_message_language(message)
             if detected_lang:
                 language = detected_lang
 
-            # Get context
-            context_chunks = memory_manager.query_memory(message) if memory_manager else []
+            # Queue for batched auto-learning in the background
+            start_auto_learn(message)
+
+            # Query memory in a worker thread while the start frame goes out
+            context_task = (
+                asyncio.create_task(asyncio.to_thread(memory_manager.query_memory, message))
+                if memory_manager else None
+            )
 
             # Stream response
             await websocket.send_json({"type": "start"})
+            context_chunks = await context_task if context_task else []
 
             full_response = ""
             for chunk in llm_client.get_response_stream(
@@ -195,17 +238,6 @@ async def websocket_chat(websocket: WebSocket):
             if commands.get("language"):
                 active_language = commands["language"]
 
-            # Auto-learn personal facts in background
-            if memory_manager:
-                def auto_learn(text=message):
-                    try:
-                        fact = llm_client.extract_personal_info(text)
-                        if fact:
-                            memory_manager.add_memory(fact)
-                    except Exception as e:
-                        print(f"[AutoLearn] Error: {e}")
-                threading.Thread(target=auto_learn, daemon=True).start()
-
             await websocket.send_json({
                 "type": "done",
                 "response": clean_response,
@@ -227,10 +259,20 @@ async def serve_spa(request: Request, full_path: str):
     """Serve React frontend for any non-API, non-WS path."""
     # Serve root-level static files (e.g. bot-icon.png, manifest.json)
     if full_path:
+        cached = STATIC_CACHE.get(full_path)
+        if cached is not None:
+            media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+            return Response(content=cached, media_type=media_type)
         static_file = FRONTEND_DIR / full_path
         if static_file.is_file():
             return FileResponse(str(static_file))
     # Fall back to index.html for SPA routing
+    index_bytes = STATIC_CACHE.get("index.html")
+    if index_bytes is not None:
+        headers = {"ETag": INDEX_ETAG, "Cache-Control": "no-cache"}
+        if request.headers.get("if-none-match") == INDEX_ETAG:
+            return Response(status_code=304, headers=headers)
+        return Response(content=index_bytes, media_type="text/html", headers=headers)
     index_file = FRONTEND_DIR / "index.html"
     if index_file.is_file():
         return FileResponse(str(index_file))
@@ -2,11 +2,14 @@
 Business services for KidBot.
 """
 
-from .interactions import save_interaction, load_interactions
+from .interactions import save_interaction, load_interactions, get_today_interactions
 from .email import send_report_email
+from .auto_learn import AutoLearner
 
 __all__ = [
     "save_interaction",
     "load_interactions",
+    "get_today_interactions",
     "send_report_email",
+    "AutoLearner",
 ]
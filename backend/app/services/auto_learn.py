@@ -0,0 +1,92 @@
+"""
+Auto-learn service for saving personal facts from conversation.
+
+Collects child utterances and extracts facts in batches, so a single LLM
+call covers several turns instead of one call per message.
+"""
+
+import queue
+import threading
+import time
+from typing import List
+
+from ..core.llm_client import is_fact_candidate
+
+# Default settings
+DEFAULT_BATCH_SIZE = 4
+DEFAULT_FLUSH_SECONDS = 10.0
+
+
+class AutoLearner:
+    """Background batcher for personal-fact extraction."""
+
+    def __init__(
+        self,
+        llm_client,
+        memory_manager,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_seconds: float = DEFAULT_FLUSH_SECONDS
+    ):
+        """Initialize and start the background worker."""
+        self.llm_client = llm_client
+        self.memory_manager = memory_manager
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+
+        self._queue: queue.Queue = queue.Queue()
+        self._stopped = threading.Event()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, message: str):
+        """Queue a child message for fact extraction."""
+        if message and is_fact_candidate(message):
+            self._queue.put(message)
+
+    def stop(self, timeout: float = 30.0):
+        """Flush pending messages and stop the worker."""
+        self._stopped.set()
+        self._worker.join(timeout=timeout)
+
+    def _run(self):
+        """Collect messages until the batch is full or the flush interval passes."""
+        pending: List[str] = []
+        deadline = None
+
+        while True:
+            timeout = 0.5 if deadline is None else max(0.0, min(0.5, deadline - time.monotonic()))
+            try:
+                pending.append(self._queue.get(timeout=timeout))
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_seconds
+            except queue.Empty:
+                pass
+
+            stopping = self._stopped.is_set()
+            if stopping:
+                # Drain anything submitted before stop()
+                while True:
+                    try:
+                        pending.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+            due = deadline is not None and time.monotonic() >= deadline
+            while pending and (len(pending) >= self.batch_size or due or stopping):
+                batch, pending = pending[:self.batch_size], pending[self.batch_size:]
+                self._process(batch)
+            if not pending:
+                deadline = None
+
+            if stopping:
+                return
+
+    def _process(self, batch: List[str]):
+        """Extract facts from a batch of messages and save them to memory."""
+        try:
+            facts = self.llm_client.extract_personal_info_batch(batch)
+            for fact in facts:
+                if fact:
+                    self.memory_manager.add_memory(fact)
+        except Exception as e:
+            print(f"[AutoLearn] Error: {e}")
@@ -3,68 +3,125 @@ Interaction tracking service for daily reports.
 """
 
 import json
-from datetime import datetime, date
-from pathlib import Path
-from typing import List, Dict
+from collections import deque
+from datetime import datetime, date, timedelta
+from typing import Deque, Dict, List, Tuple
 
 from ..config import DATA_DIR
 
 
-INTERACTIONS_FILE = DATA_DIR / "daily_interactions.json"
+INTERACTIONS_FILE = DATA_DIR / "daily_interactions.jsonl"
 
-# In-memory cache
-_daily_interactions: List[Dict] = []
+# Older versions stored one JSON array; it is merged and removed on load
+LEGACY_INTERACTIONS_FILE = DATA_DIR / "daily_interactions.json"
 
+# Days of interactions kept in memory and on disk
+RETENTION_DAYS = 7
 
-def load_interactions() -> List[Dict]:
-    """Load today's interactions from file."""
-    global _daily_interactions
+# In-memory cache of the retention window, partitioned by ISO date
+_interactions_by_date: Dict[str, Deque[Dict]] = {}
+
+
+def _retention_cutoff(today: str) -> str:
+    """Oldest ISO date still inside the retention window."""
+    return (date.fromisoformat(today) - timedelta(days=RETENTION_DAYS)).isoformat()
+
+
+def _prune_old_dates(today: str) -> bool:
+    """Drop partitions older than the retention window. Returns True if any were dropped."""
+    cutoff = _retention_cutoff(today)
+    stale = [day for day in _interactions_by_date if day < cutoff]
+    for day in stale:
+        del _interactions_by_date[day]
+    return bool(stale)
+
+
+def _read_log() -> Tuple[List[Dict], bool]:
+    """
+    Read every stored interaction (legacy JSON array first, then the JSON Lines log).
     
-    if INTERACTIONS_FILE.exists():
+    Returns (records, legacy_migrated). An unreadable legacy file is left in
+    place for the next load instead of being merged and deleted.
+    """
+    records = []
+    legacy_migrated = False
+    if LEGACY_INTERACTIONS_FILE.exists():
         try:
-            with open(INTERACTIONS_FILE, 'r') as f:
-                data = json.load(f)
-                # Only load today's interactions
-                today = date.today().isoformat()
-                _daily_interactions = [i for i in data if i.get('date') == today]
-        except Exception as e:
-            print(f"[Interactions] Error loading: {e}")
-            _daily_interactions = []
+            with open(LEGACY_INTERACTIONS_FILE, 'r') as f:
+                records.extend(json.load(f))
+            legacy_migrated = True
+        except json.JSONDecodeError as e:
+            print(f"[Interactions] Could not read legacy file, leaving it in place: {e}")
+    if INTERACTIONS_FILE.exists():
+        with open(INTERACTIONS_FILE, 'r') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                # A crash mid-append can leave a truncated line; skip it rather
+                # than losing the rest of the log
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    print(f"[Interactions] Skipping unreadable line {line_number}")
+    return records, legacy_migrated
+
+
+def _rewrite_log():
+    """Rewrite the log from memory, dropping anything outside the retention window."""
+    INTERACTIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = INTERACTIONS_FILE.with_suffix(".jsonl.tmp")
+    with open(tmp_file, 'w') as f:
+        for day in sorted(_interactions_by_date):
+            for interaction in _interactions_by_date[day]:
+                f.write(json.dumps(interaction) + "\n")
+    tmp_file.replace(INTERACTIONS_FILE)
+
+
+def load_interactions() -> List[Dict]:
+    """Load the retention window from file and return today's interactions."""
+    global _interactions_by_date
+    
+    today = date.today().isoformat()
+    cutoff = _retention_cutoff(today)
+    try:
+        by_date: Dict[str, Deque[Dict]] = {}
+        records, legacy_migrated = _read_log()
+        for interaction in records:
+            day = interaction.get('date', '')
+            if day >= cutoff:
+                by_date.setdefault(day, deque()).append(interaction)
+        _interactions_by_date = by_date
+        
+        # Compact the log once per load (also migrates the legacy file)
+        _rewrite_log()
+        if legacy_migrated:
+            LEGACY_INTERACTIONS_FILE.unlink()
+    except Exception as e:
+        print(f"[Interactions] Error loading: {e}")
     
-    return _daily_interactions
+    return list(_interactions_by_date.get(today, ()))
 
 
 def save_interaction(mode: str, user_msg: str, bot_response: str):
     """Save an interaction for daily report."""
-    global _daily_interactions
-    
+    today = date.today().isoformat()
     interaction = {
         "timestamp": datetime.now().isoformat(),
-        "date": date.today().isoformat(),
+        "date": today,
         "mode": mode,
         "user_message": user_msg,
         "bot_response": bot_response,
     }
-    _daily_interactions.append(interaction)
+    _interactions_by_date.setdefault(today, deque()).append(interaction)
     
-    # Save to file
+    # Append one line; the whole log is only rewritten when a day expires
     try:
-        INTERACTIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Load existing and append
-        existing = []
-        if INTERACTIONS_FILE.exists():
-            with open(INTERACTIONS_FILE, 'r') as f:
-                existing = json.load(f)
-        
-        existing.append(interaction)
-        
-        # Keep only last 7 days
-        cutoff = date.today().isoformat()
-        existing = [i for i in existing if i.get('date', '') >= cutoff[:8]]
-        
-        with open(INTERACTIONS_FILE, 'w') as f:
-            json.dump(existing, f, indent=2)
+        if _prune_old_dates(today):
+            _rewrite_log()
+        else:
+            INTERACTIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(INTERACTIONS_FILE, 'a') as f:
+                f.write(json.dumps(interaction) + "\n")
             
     except Exception as e:
         print(f"[Interactions] Error saving: {e}")
@@ -72,9 +129,4 @@ def save_interaction(mode: str, user_msg: str, bot_response: str):
 
 def get_today_interactions() -> List[Dict]:
     """Get today's interactions."""
-    global _daily_interactions
-    
-    if not _daily_interactions:
-        load_interactions()
-    
-    return _daily_interactions
+    return list(_interactions_by_date.get(date.today().isoformat(), ()))
@@ -6,14 +6,31 @@ Starts both the FastAPI backend and React frontend concurrently.
 """
 
 import os
+import shutil
 import subprocess
 import sys
 import signal
+import time
 from pathlib import Path
 
 # Get project root
 PROJECT_ROOT = Path(__file__).parent.parent
 
+
+def stop_process(proc: subprocess.Popen):
+    """Terminate a server along with any children it spawned."""
+    if proc.poll() is not None:
+        return
+    if os.name == "posix":
+        # Each server runs in its own session, so this reaches vite / the uvicorn reloader too
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    else:
+        proc.terminate()
+
+
 def main():
     """Run both backend and frontend servers."""
     processes = []
@@ -31,18 +48,20 @@ def main():
         backend_proc = subprocess.Popen(
             backend_cmd,
             cwd=PROJECT_ROOT,
-            env={**os.environ, "PYTHONPATH": str(PROJECT_ROOT)}
+            env={**os.environ, "PYTHONPATH": str(PROJECT_ROOT)},
+            start_new_session=True
         )
         processes.append(backend_proc)
         
         # Start frontend
         print("[dev] Starting React frontend on http://localhost:5173")
         frontend_dir = PROJECT_ROOT / "frontend"
-        frontend_cmd = ["npm", "run", "dev"]
+        # Resolve npm directly (npm.cmd on Windows) instead of going through a shell
+        frontend_cmd = [shutil.which("npm") or "npm", "run", "dev"]
         frontend_proc = subprocess.Popen(
             frontend_cmd,
             cwd=frontend_dir,
-            shell=True
+            start_new_session=True
         )
         processes.append(frontend_proc)
         
@@ -52,14 +71,16 @@ def main():
         print("   API Docs: http://localhost:8000/docs")
         print("\nPress Ctrl+C to stop...\n")
         
-        # Wait for processes
-        for proc in processes:
-            proc.wait()
+        # Wait until either server exits, then stop the other
+        while all(proc.poll() is None for proc in processes):
+            time.sleep(0.5)
+        print("\n[dev] A server exited, stopping the rest...")
             
     except KeyboardInterrupt:
         print("\n\n[dev] Stopping servers...")
+    finally:
         for proc in processes:
-            proc.terminate()
+            stop_process(proc)
         for proc in processes:
             proc.wait()
         print("[dev] Servers stopped.")
@@ -6,21 +6,36 @@ Installs dependencies and sets up the project.
 """
 
 import os
+import shutil
 import subprocess
 import sys
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).parent.parent
 
+# Data directories created on setup (each gets a .gitkeep)
+DATA_DIRS = (
+    PROJECT_ROOT / "data" / "raw_docs",
+    PROJECT_ROOT / "data" / "vector_store",
+    PROJECT_ROOT / "data" / "voice_prints",
+)
+
 
 def run_command(cmd, cwd=None):
-    """Run a command and print output."""
+    """Run a command, streaming its output as it is produced."""
     print(f"Running: {' '.join(cmd)}")
-    result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
-    if result.stdout:
-        print(result.stdout)
-    if result.returncode != 0:
-        print(f"Error: {result.stderr}")
+    with subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=1,
+        text=True
+    ) as proc:
+        for line in proc.stdout:
+            print(line, end="")
+    if proc.returncode != 0:
+        print(f"Error: command exited with code {proc.returncode}")
         return False
     return True
 
@@ -44,15 +59,10 @@ def main():
     
     # 3. Create data directories
     print("\n[setup] Creating data directories...")
-    data_dirs = [
-        PROJECT_ROOT / "data" / "raw_docs",
-        PROJECT_ROOT / "data" / "vector_store",
-        PROJECT_ROOT / "data" / "voice_prints",
-    ]
-    for dir_path in data_dirs:
+    for dir_path in DATA_DIRS:
         dir_path.mkdir(parents=True, exist_ok=True)
-        gitkeep = dir_path / ".gitkeep"
-        gitkeep.touch()
+        # O_CREAT without truncation: one open/close, no stat or utime
+        os.close(os.open(dir_path / ".gitkeep", os.O_WRONLY | os.O_CREAT, 0o644))
     
     # 4. Create .env file if not exists
     env_file = PROJECT_ROOT / ".env"
@@ -60,8 +70,7 @@ def main():
     
     if not env_file.exists() and env_example.exists():
         print("\n[setup] Creating .env file from template...")
-        import shutil
-        shutil.copy(env_example, env_file)
+        shutil.copyfile(env_example, env_file)
         print("   Created .env - please add your API keys!")
     
     # 5. Create config if not exists
@@ -70,8 +79,7 @@ def main():
     
     if not config_file.exists() and config_example.exists():
         print("\n[setup] Creating config.yaml from template...")
-        import shutil
-        shutil.copy(config_example, config_file)
+        shutil.copyfile(config_example, config_file)
     
     print("\n[setup] Setup complete!")
     print("\nNext steps:")